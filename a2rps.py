@@ -10,66 +10,378 @@ Apache Requests Per Second (a2rps) - Analyze Apache access logs
 """
 
 import sys
+import os
+import io
+import gzip
+import zlib
 import re
+import mmap
+import stat
+import multiprocessing
+import select
+import ctypes
+import ctypes.util
 import argparse
+import calendar
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
 import time
 
 
-def parse_apache_log_line(line):
+# Epoch seconds keyed by their raw log timestamp string. Busy logs repeat the
+# same second many times, so this saves most timestamp_to_epoch() calls.
+_TS_CACHE = {}
+_TS_CACHE_MAX = 1 << 20
+
+# Minimum seconds between status line updates in follow mode
+_DISPLAY_INTERVAL = 0.1
+
+# How far (in seconds) timestamps in a single log file may run out of order.
+# Apache logs a request when it completes but stamps it with its start time.
+_LOG_ORDER_SLACK = 300
+
+# Binary search for --fromdate stops once the range is this small
+_BISECT_MIN_SPAN = 1 << 20
+
+# Each bisection probe looks at the lines in this many bytes, so that a single
+# long-running request (stamped with its start time) can't mislead it
+_BISECT_PROBE_SIZE = 4096
+
+# Series longer than this are plotted without per-point markers
+_PLOT_MARKER_MAX_POINTS = 2000
+
+# inotify event mask used to wake up follow mode when the log is written to
+_IN_MODIFY = 0x00000002
+
+# Log files with these suffixes are decompressed on the fly
+_COMPRESSED_SUFFIXES = ('.gz', '.zst')
+
+# Size of the blocks read in bulk (non-follow) mode
+_BLOCK_SIZE = 1 << 22
+
+# Mapped files at least this big get sequential readahead hints
+_READAHEAD_MIN_SIZE = 16 << 20
+
+# Large mapped files are split across worker processes, each scanning at
+# least this many bytes (so files under twice this size stay single-process)
+_PARALLEL_RANGE_MIN_SIZE = 16 << 20
+
+# Timestamp (without timezone) inside the first [...] of each line. Used to
+# scan whole blocks at once so the per-line loop runs inside the regex engine.
+_TIMESTAMP_RE = re.compile(rb'^[^\[\n]*\[([^\] \n]*)[^\]\n]*\]', re.MULTILINE)
+
+# Epoch seconds at midnight keyed by the date part of a log timestamp
+_DAY_CACHE = {}
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+
+def datetime_to_epoch(dt):
     """
-    Parse a line from Apache access log.
-    Common format: 127.0.0.1 - - [07/Nov/2025:22:06:24 +0000] "GET / HTTP/1.1" 200 1234
+    Convert a naive datetime to integer seconds since the epoch.
+    Log timestamps keep their wall-clock value; the timezone is ignored.
     """
-    # Apache log pattern (Common Log Format and Combined Log Format)
-    pattern = r'^(\S+) \S+ \S+ \[([^\]]+)\] "([^"]+)" (\d+) (\S+)'
-    match = re.match(pattern, line)
-    
-    if match:
-        ip = match.group(1)
-        timestamp_str = match.group(2)
-        request = match.group(3)
-        status = match.group(4)
-        
-        # Parse timestamp: 07/Nov/2025:22:06:24 +0000
-        try:
-            dt = datetime.strptime(timestamp_str.split()[0], '%d/%b/%Y:%H:%M:%S')
-            return dt, line
-        except ValueError:
-            return None, line
+    return calendar.timegm(dt.timetuple())
+
+
+def timestamp_to_epoch(s):
+    """
+    Convert an Apache timestamp without its timezone, e.g. 07/Nov/2025:22:06:24,
+    to integer epoch seconds. The fields sit at fixed offsets, so they are
+    sliced out and combined arithmetically instead of going through
+    strptime(); only the date part is validated by datetime, once per day.
+    Returns None if the string is not a valid timestamp.
+    """
+    if len(s) != 20 or not s.isascii():
+        return None
+    if s[2] != '/' or s[6] != '/' or s[11] != ':' or s[14] != ':' or s[17] != ':':
+        return None
+    # int() would also accept signs and padding spaces
+    if not (s[0:2] + s[7:11] + s[12:14] + s[15:17] + s[18:20]).isdigit():
+        return None
+    date_str = s[:11]
+    day = _DAY_CACHE.get(date_str)
+    try:
+        if day is None:
+            day = datetime_to_epoch(datetime(int(s[7:11]), _MONTHS[s[3:6]], int(s[0:2])))
+            _DAY_CACHE[date_str] = day
+        hour = int(s[12:14])
+        minute = int(s[15:17])
+        second = int(s[18:20])
+    except (KeyError, ValueError):
+        return None
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return day + hour * 3600 + minute * 60 + second
+
+
+def format_epoch(sec):
+    """
+    Format integer epoch seconds for display.
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(sec))
+
+
+def parse_log_epoch(line):
+    """
+    Return the timestamp of an Apache log line as integer epoch seconds,
+    or None if the line has no valid timestamp.
+
+    Only the timestamp is needed, and it always sits between the first
+    '[' and the following ']', so slice it out directly instead of
+    matching the whole line with a regex.
+    """
+    i = line.find('[')
+    if i == -1:
+        return None
+    j = line.find(']', i + 1)
+    if j == -1:
+        return None
+
+    # Parse timestamp: 07/Nov/2025:22:06:24 +0000
+    timestamp_str = line[i + 1:j]
+    sp = timestamp_str.find(' ')
+    if sp != -1:
+        timestamp_str = timestamp_str[:sp]
+
+    sec = _TS_CACHE.get(timestamp_str)
+    if sec is None:
+        sec = timestamp_to_epoch(timestamp_str)
+        if sec is None:
+            return None
+        if len(_TS_CACHE) >= _TS_CACHE_MAX:
+            _TS_CACHE.clear()
+        _TS_CACHE[timestamp_str] = sec
+
+    return sec
+
+
+def read_blocks(file_handle, block_size=_BLOCK_SIZE):
+    """
+    Generator that yields large chunks of a binary file, each ending on a
+    line boundary.
+    """
+    leftover = b''
+    while True:
+        buf = file_handle.read(block_size)
+        if not buf:
+            break
+        if leftover:
+            buf = leftover + buf
+        end = buf.rfind(b'\n') + 1
+        leftover = buf[end:]
+        if end:
+            yield buf[:end]
+    if leftover:
+        yield leftover
+
+
+def count_timestamps(blocks):
+    """
+    Count how many log lines carry each raw timestamp in the given blocks.
+    """
+    raw_counts = Counter()
+    for block in blocks:
+        raw_counts.update(_TIMESTAMP_RE.findall(block))
+    return raw_counts
+
+
+def map_file(file_handle):
+    """
+    Memory-map a regular file for reading.
+    Returns (mmap, start offset), or (None, 0) if the file can't be mapped
+    (pipes, terminals, empty files...).
+    """
+    # Decompressing readers (gzip...) expose the fd of the compressed file
+    if not isinstance(file_handle, (io.FileIO, io.BufferedReader)):
+        return None, 0
+    try:
+        fd = file_handle.fileno()
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None, 0
+        start = os.lseek(fd, 0, os.SEEK_CUR)
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return None, 0
+    
+    if len(mm) - start >= _READAHEAD_MIN_SIZE:
+        advise_sequential(mm, start)
+    return mm, start
+
+
+def advise_sequential(mm, start=0, end=None):
+    """
+    Tell the kernel that mm[start:end] is read front to back exactly once,
+    so it reads ahead aggressively and drops pages behind us.
+    """
+    if not hasattr(mmap, 'MADV_SEQUENTIAL'):
+        return
+    if end is None:
+        end = len(mm)
+    # madvise() needs a page-aligned start
+    start -= start % mmap.PAGESIZE
+    if end <= start:
+        return
+    try:
+        mm.madvise(mmap.MADV_SEQUENTIAL, start, end - start)
+    except OSError:
+        pass
+
+
+def _first_epoch(mm, pos, end):
+    """
+    Return the epoch second of the first timestamp in mm[pos:end], or None.
+    """
+    match = _TIMESTAMP_RE.search(mm, pos, end)
+    if match is None:
+        return None
+    return timestamp_to_epoch(match.group(1).decode('latin-1'))
+
+
+def _probe_epoch(mm, pos, end):
+    """
+    Return the latest epoch second among the lines in the probe window that
+    starts at pos (or the first timestamp after it, if the window has none).
+    """
+    window_end = min(pos + _BISECT_PROBE_SIZE, end)
+    latest = None
+    for match in _TIMESTAMP_RE.finditer(mm, pos, window_end):
+        sec = timestamp_to_epoch(match.group(1).decode('latin-1'))
+        if sec is not None and (latest is None or sec > latest):
+            latest = sec
+    if latest is None:
+        return _first_epoch(mm, window_end, end)
+    return latest
+
+
+def bisect_log_offset(mm, from_ts, start=0):
+    """
+    Binary-search a mapped, time-ordered log file for a line-aligned offset
+    from which scanning finds every line at or after from_ts. Everything
+    before the returned offset is older than from_ts, so it can be skipped.
+    """
+    target = from_ts - _LOG_ORDER_SLACK
+    lo, hi = start, len(mm)
+    while hi - lo > _BISECT_MIN_SPAN:
+        mid = (lo + hi) // 2
+        nl = mm.find(b'\n', mid, hi)
+        if nl == -1:
+            hi = mid
+            continue
+        sec = _probe_epoch(mm, nl + 1, hi)
+        if sec is None or sec >= target:
+            hi = mid
+        else:
+            lo = nl + 1
+    return lo
+
+
+def count_mapped_timestamps(mm, start=0, end=None, to_ts=None):
+    """
+    Count how many log lines carry each raw timestamp in mm[start:end].
+    The regex runs directly over the mapping a block at a time, so no line
+    or block is ever copied into a Python object.
     
-    return None, line
+    A single log file is in time order, so when to_ts is given the scan
+    stops at the first block that starts well past it.
+    """
+    if end is None:
+        end = len(mm)
+    raw_counts = Counter()
+    pos = start
+    while pos < end:
+        stop = pos + _BLOCK_SIZE
+        if stop < end:
+            # Cut the block at a line boundary
+            nl = mm.rfind(b'\n', pos, stop)
+            if nl == -1:
+                nl = mm.find(b'\n', stop, end)
+            stop = nl + 1 if nl != -1 else end
+        else:
+            stop = end
+        if to_ts is not None:
+            first = _first_epoch(mm, pos, stop)
+            if first is not None and first > to_ts + _LOG_ORDER_SLACK:
+                break
+        raw_counts.update(_TIMESTAMP_RE.findall(mm, pos, stop))
+        pos = stop
+    return raw_counts
+
+
+def _count_file_range(task):
+    """
+    Worker for count_file_timestamps(): count timestamps in one byte range.
+    """
+    path, start, end, to_ts = task
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            advise_sequential(mm, start, end)
+            return count_mapped_timestamps(mm, start, end, to_ts)
+
+
+def usable_cpu_count():
+    """
+    Number of CPUs this process may run on.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 
-def calculate_rps(timestamps, window_seconds=1):
+def count_file_timestamps(file_handle, mm, start=0, to_ts=None):
     """
-    Calculate requests per second from a list of timestamps.
-    Groups by second and returns the count per second.
+    Count timestamps in a mapped log file, splitting large files into
+    line-aligned byte ranges that are scanned by a pool of worker processes.
+    Lines past to_ts are skipped where possible (see count_mapped_timestamps()).
     """
-    if not timestamps:
-        return {}
+    size = len(mm)
+    workers = min(usable_cpu_count(), (size - start) // _PARALLEL_RANGE_MIN_SIZE)
+    path = getattr(file_handle, 'name', None)
     
-    # Group by second
-    counts = defaultdict(int)
-    for ts in timestamps:
-        # Round to the nearest second
-        key = ts.replace(microsecond=0)
-        counts[key] += 1
+    if workers < 2 or not isinstance(path, str):
+        return count_mapped_timestamps(mm, start, to_ts=to_ts)
     
-    return dict(sorted(counts.items()))
+    # Workers reopen the file by name, so make sure it is the same file
+    try:
+        st = os.stat(path)
+        fst = os.fstat(file_handle.fileno())
+    except OSError:
+        return count_mapped_timestamps(mm, start, to_ts=to_ts)
+    if (st.st_dev, st.st_ino) != (fst.st_dev, fst.st_ino):
+        return count_mapped_timestamps(mm, start, to_ts=to_ts)
+    
+    bounds = [start]
+    chunk = (size - start) // workers
+    for k in range(1, workers):
+        nl = mm.find(b'\n', start + k * chunk)
+        bound = nl + 1 if nl != -1 else size
+        if bound > bounds[-1]:
+            bounds.append(bound)
+    if bounds[-1] < size:
+        bounds.append(size)
+    tasks = [(path, lo, hi, to_ts) for lo, hi in zip(bounds, bounds[1:])]
+    
+    raw_counts = Counter()
+    with multiprocessing.Pool(len(tasks)) as pool:
+        for partial in pool.imap_unordered(_count_file_range, tasks):
+            raw_counts.update(partial)
+    return raw_counts
 
 
-def filter_by_date(timestamps, fromdate=None, todate=None):
+def parse_date_range(fromdate=None, todate=None):
     """
-    Filter timestamps by date range.
+    Convert --fromdate/--todate strings (YYYY-MM-DD) to datetime bounds.
+    Returns (from_dt, to_dt); a bound is None when not given or invalid.
     """
-    filtered = timestamps
+    from_dt = None
+    to_dt = None
     
     if fromdate:
         try:
             from_dt = datetime.strptime(fromdate, '%Y-%m-%d')
-            filtered = [ts for ts in filtered if ts >= from_dt]
         except ValueError:
             print(f"Warning: Invalid fromdate format: {fromdate}", file=sys.stderr)
     
@@ -78,11 +390,10 @@ def filter_by_date(timestamps, fromdate=None, todate=None):
             to_dt = datetime.strptime(todate, '%Y-%m-%d')
             # Include the entire day
             to_dt = to_dt.replace(hour=23, minute=59, second=59)
-            filtered = [ts for ts in filtered if ts <= to_dt]
         except ValueError:
             print(f"Warning: Invalid todate format: {todate}", file=sys.stderr)
     
-    return filtered
+    return from_dt, to_dt
 
 
 def print_rps(rps_data):
@@ -95,21 +406,24 @@ def print_rps(rps_data):
     
     print("\nRequests Per Second:")
     print("-" * 50)
-    for timestamp, count in rps_data.items():
-        print(f"{timestamp.strftime('%Y-%m-%d %H:%M:%S')}: {count} req/s")
-    
-    if rps_data:
-        values = list(rps_data.values())
-        avg_rps = sum(values) / len(values)
-        max_rps = max(values)
-        min_rps = min(values)
-        total_requests = sum(values)
-        
-        print("-" * 50)
-        print(f"Total requests: {total_requests}")
-        print(f"Average RPS: {avg_rps:.2f}")
-        print(f"Max RPS: {max_rps}")
-        print(f"Min RPS: {min_rps}")
+    # Collect the summary stats in the same pass
+    total_requests = 0
+    max_rps = None
+    min_rps = None
+    for timestamp, count in sorted(rps_data.items()):
+        print(f"{format_epoch(timestamp)}: {count} req/s")
+        total_requests += count
+        if max_rps is None or count > max_rps:
+            max_rps = count
+        if min_rps is None or count < min_rps:
+            min_rps = count
+    avg_rps = total_requests / len(rps_data)
+    
+    print("-" * 50)
+    print(f"Total requests: {total_requests}")
+    print(f"Average RPS: {avg_rps:.2f}")
+    print(f"Max RPS: {max_rps}")
+    print(f"Min RPS: {min_rps}")
 
 
 def plot_rps(rps_data, output_path='a2rps.png'):
@@ -117,7 +431,7 @@ def plot_rps(rps_data, output_path='a2rps.png'):
     Create a plot of RPS data using matplotlib and save to file.
     
     Args:
-        rps_data: Dictionary of timestamp -> request count
+        rps_data: Dictionary of epoch second -> request count
         output_path: Path where to save the plot (default: 'a2rps.png')
     """
     try:
@@ -125,6 +439,7 @@ def plot_rps(rps_data, output_path='a2rps.png'):
         matplotlib.use('Agg')  # Use non-GUI backend
         import matplotlib.pyplot as plt
         import matplotlib.dates as mdates
+        import numpy as np
     except ImportError:
         print("Error: matplotlib is required for plotting. Install it with: pip install matplotlib", file=sys.stderr)
         return
@@ -133,11 +448,18 @@ def plot_rps(rps_data, output_path='a2rps.png'):
         print("No data to plot")
         return
     
-    timestamps = list(rps_data.keys())
-    values = list(rps_data.values())
+    n = len(rps_data)
+    timestamps = np.fromiter(rps_data.keys(), dtype=np.int64, count=n)
+    values = np.fromiter(rps_data.values(), dtype=np.int64, count=n)
+    order = np.argsort(timestamps, kind='stable')
+    timestamps = timestamps[order].astype('datetime64[s]')
+    values = values[order]
+    
+    # Per-point markers only help (and only stay cheap) on short series
+    marker_style = {'marker': 'o', 'markersize': 3} if n < _PLOT_MARKER_MAX_POINTS else {}
     
     plt.figure(figsize=(12, 6))
-    plt.plot(timestamps, values, marker='o', linestyle='-', linewidth=1, markersize=3)
+    plt.plot(timestamps, values, linestyle='-', linewidth=1, **marker_style)
     plt.xlabel('Time')
     plt.ylabel('Requests Per Second')
     plt.title('Apache Requests Per Second')
@@ -158,103 +480,262 @@ def plot_rps(rps_data, output_path='a2rps.png'):
     print(f"Plot saved to: {output_path}")
 
 
+def inotify_watch(path):
+    """
+    Return an inotify file descriptor that becomes readable whenever path is
+    modified, or None if inotify is not available (non-Linux systems...).
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path), _IN_MODIFY) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
 def follow_file(file_handle):
     """
     Generator that yields new lines from a file as they are written (like tail -f).
+    Yields None whenever it has caught up and is about to wait for more.
     """
     # Move to the end of the file
     file_handle.seek(0, 2)
     
-    while True:
-        line = file_handle.readline()
-        if not line:
-            time.sleep(0.1)  # Sleep briefly to avoid busy waiting
-            continue
-        yield line
+    # Block on inotify until the file changes; fall back to polling
+    path = getattr(file_handle, 'name', None)
+    watch_fd = inotify_watch(path) if isinstance(path, str) else None
+    
+    try:
+        while True:
+            line = file_handle.readline()
+            if not line:
+                yield None
+                if watch_fd is None:
+                    time.sleep(0.1)  # Sleep briefly to avoid busy waiting
+                    continue
+                # The timeout is only a safety net for missed events
+                select.select([watch_fd], [], [], 1.0)
+                try:
+                    while os.read(watch_fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+            yield line
+    finally:
+        if watch_fd is not None:
+            os.close(watch_fd)
+
+
+class CompressedLogError(Exception):
+    """
+    Raised when a compressed log file can't be opened.
+    """
 
 
-def process_log_file(file_handle, follow=False, fromdate=None, todate=None, plot_path=None):
+class ZstdReader:
+    """
+    Minimal binary reader that decompresses a .zst file block by block.
+    Unlike zstandard's stream_reader(), a file that ends mid-frame raises
+    EOFError, the same way a truncated .gz file does.
+    """
+    
+    def __init__(self, f, decompressor):
+        self._f = f
+        self._decompressor = decompressor
+        self._dobj = decompressor.decompressobj()
+        self._empty = True
+    
+    def read(self, size=-1):
+        """
+        Return the next chunk of decompressed data (of any length), or b''
+        at the end of the file. size is accepted for file API compatibility.
+        """
+        while True:
+            chunk = self._f.read(_BLOCK_SIZE)
+            if not chunk:
+                # An empty file is just an empty log, like with gzip
+                if not self._dobj.eof and not self._empty:
+                    raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+                return b''
+            self._empty = False
+            data = self._dobj.decompress(chunk)
+            # Concatenated .zst files hold several frames
+            while self._dobj.eof and self._dobj.unused_data:
+                rest = self._dobj.unused_data
+                self._dobj = self._decompressor.decompressobj()
+                data += self._dobj.decompress(rest)
+            if data:
+                return data
+    
+    def close(self):
+        self._f.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_compressed(path):
+    """
+    Whether path is a compressed log that open_log_file() decompresses.
+    """
+    return path.endswith(_COMPRESSED_SUFFIXES)
+
+
+def open_log_file(path):
+    """
+    Open a log file for bulk (binary) reading. .gz and .zst files are
+    decompressed on the fly, so rotated logs don't need a zcat pipe.
+    """
+    if not is_compressed(path):
+        return open(path, 'rb', buffering=0)
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    
+    try:
+        import zstandard
+    except ImportError:
+        raise CompressedLogError(
+            "zstandard is required for .zst files. Install it with: pip install zstandard"
+        ) from None
+    f = open(path, 'rb')
+    try:
+        return ZstdReader(f, zstandard.ZstdDecompressor())
+    except BaseException:
+        f.close()
+        raise
+
+
+def decompression_errors():
+    """
+    Exception types raised while reading corrupt or truncated compressed logs.
+    """
+    errors = (gzip.BadGzipFile, zlib.error, EOFError)
+    # Only known once open_log_file() has imported zstandard
+    zstandard = sys.modules.get('zstandard')
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    return errors
+
+
+def process_log_file(file_handle, follow=False, from_dt=None, to_dt=None, plot_path=None):
     """
     Process log file and calculate RPS.
     
     Args:
-        file_handle: File handle to read logs from
+        file_handle: File handle to read logs from (binary, unless following)
         follow: Whether to follow the file (tail -f mode)
-        fromdate: Filter logs from this date
-        todate: Filter logs to this date
+        from_dt: Only count requests at or after this datetime
+        to_dt: Only count requests at or before this datetime
         plot_path: If provided, save plot to this path instead of printing stats
     """
-    timestamps = []
+    from_ts = datetime_to_epoch(from_dt) if from_dt is not None else None
+    to_ts = datetime_to_epoch(to_dt) if to_dt is not None else None
     
     if follow and not plot_path:
         # Follow mode only works when plot is not requested
         print("Following log file... (Ctrl+C to stop)")
         print("-" * 50)
         
-        # Process existing lines first if in follow mode
+        # Process existing lines first if in follow mode. Lines are keyed by
+        # their epoch second directly, without building a datetime per line
+        counts = defaultdict(int)
         for line in file_handle:
-            dt, _ = parse_apache_log_line(line.strip())
-            if dt:
-                timestamps.append(dt)
-        
-        # Apply date filters
-        if fromdate or todate:
-            timestamps = filter_by_date(timestamps, fromdate, todate)
+            sec = parse_log_epoch(line)
+            if sec is None:
+                continue
+            if from_ts is not None and sec < from_ts:
+                continue
+            if to_ts is not None and sec > to_ts:
+                continue
+            counts[sec] += 1
         
         # Show initial stats
-        rps_data = calculate_rps(timestamps)
-        if rps_data:
-            values = list(rps_data.values())
-            avg_rps = sum(values) / len(values) if values else 0
-            print(f"Initial: {len(timestamps)} requests, Avg RPS: {avg_rps:.2f}")
+        if counts:
+            total_requests = sum(counts.values())
+            avg_rps = total_requests / len(counts)
+            print(f"Initial: {total_requests} requests, Avg RPS: {avg_rps:.2f}")
             print("-" * 50)
         
-        # Now follow for new lines
+        def show_status(sec):
+            sys.stdout.write(f"{format_epoch(sec)}: {counts[sec]} req/s\r")
+            sys.stdout.flush()
+        
+        # Now follow for new lines, updating the per-second counts in place.
+        # The status line is redrawn at most every _DISPLAY_INTERVAL; an update
+        # held back by that limit is shown as soon as the reader goes idle.
+        last_print = -_DISPLAY_INTERVAL
+        pending = None
         try:
             for line in follow_file(file_handle):
-                dt, _ = parse_apache_log_line(line.strip())
-                if dt:
+                if line is None:
+                    if pending is not None:
+                        show_status(pending)
+                        pending = None
+                        last_print = time.monotonic()
+                    continue
+                
+                sec = parse_log_epoch(line)
+                if sec is not None:
                     # Check date filter
-                    if fromdate or todate:
-                        filtered = filter_by_date([dt], fromdate, todate)
-                        if not filtered:
-                            continue
+                    if from_ts is not None and sec < from_ts:
+                        continue
+                    if to_ts is not None and sec > to_ts:
+                        continue
                     
-                    timestamps.append(dt)
+                    counts[sec] += 1
+                    pending = sec
                     
-                    # Recalculate and display current RPS
-                    rps_data = calculate_rps(timestamps)
-                    if rps_data:
-                        latest = list(rps_data.items())[-1]
-                        print(f"{latest[0].strftime('%Y-%m-%d %H:%M:%S')}: {latest[1]} req/s", end='\r')
-                        sys.stdout.flush()
+                    # Display current RPS
+                    now = time.monotonic()
+                    if now - last_print >= _DISPLAY_INTERVAL:
+                        show_status(pending)
+                        pending = None
+                        last_print = now
         except KeyboardInterrupt:
             print("\n\nStopped following log file.")
             # Show final stats
-            rps_data = calculate_rps(timestamps)
-            print_rps(rps_data)
+            print_rps(counts)
         return
     
     # Warn if follow was requested with plot
     if follow and plot_path:
         print("Warning: --follow (-f) is ignored when --plot is used", file=sys.stderr)
     
-    # Process all lines (non-follow mode or plot mode)
-    for line in file_handle:
-        line = line.strip()
-        if not line:
+    # Process all lines (non-follow mode or plot mode) a block at a time,
+    # then parse each distinct timestamp only once
+    mm, start = map_file(file_handle)
+    if mm is not None:
+        with mm:
+            if from_ts is not None:
+                start = bisect_log_offset(mm, from_ts, start)
+            raw_counts = count_file_timestamps(file_handle, mm, start, to_ts)
+    else:
+        raw_counts = count_timestamps(read_blocks(file_handle))
+    
+    counts = defaultdict(int)
+    for timestamp, n in raw_counts.items():
+        sec = timestamp_to_epoch(timestamp.decode('latin-1'))
+        if sec is None:
+            continue
+        if from_ts is not None and sec < from_ts:
+            continue
+        if to_ts is not None and sec > to_ts:
             continue
         
-        dt, _ = parse_apache_log_line(line)
-        if dt:
-            timestamps.append(dt)
+        counts[sec] += n
     
-    # Apply date filters
-    if fromdate or todate:
-        timestamps = filter_by_date(timestamps, fromdate, todate)
-    
-    # Calculate and display RPS
-    rps_data = calculate_rps(timestamps)
+    rps_data = dict(counts)
     
     if plot_path:
         plot_rps(rps_data, plot_path)
@@ -283,6 +764,9 @@ Examples:
   # Generate and save a plot to specific path
   %(prog)s --plot ~/my_plot.png /var/log/apache2/access.log
   
+  # Read a compressed (.gz or .zst) log file
+  %(prog)s /var/log/apache2/access.log.2.gz
+  
   # Read from stdin
   zcat /var/log/apache2/access.log.gz | %(prog)s -
   
@@ -298,7 +782,8 @@ Examples:
         'logfile',
         nargs='?',
         default='/var/log/apache2/access.log',
-        help='Apache log file to analyze (use - for stdin, default: /var/log/apache2/access.log)'
+        help='Apache log file to analyze, optionally .gz or .zst compressed '
+             '(use - for stdin, default: /var/log/apache2/access.log)'
     )
     
     parser.add_argument(
@@ -327,6 +812,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    from_dt, to_dt = parse_date_range(args.fromdate, args.todate)
     
     # Handle stdin input
     if args.logfile == '-':
@@ -334,20 +820,33 @@ Examples:
             print("Error: Cannot use --follow with stdin input", file=sys.stderr)
             sys.exit(1)
         
-        process_log_file(sys.stdin, follow=False, fromdate=args.fromdate, 
-                        todate=args.todate, plot_path=args.plot)
+        process_log_file(sys.stdin.buffer, follow=False, from_dt=from_dt,
+                        to_dt=to_dt, plot_path=args.plot)
     else:
         # Handle file input
+        # Bulk mode reads raw bytes; only follow mode works line by line
+        follow = args.follow and not args.plot
+        if follow and is_compressed(args.logfile):
+            print("Error: Cannot use --follow with compressed input", file=sys.stderr)
+            sys.exit(1)
+        
         try:
-            with open(args.logfile, 'r') as f:
-                process_log_file(f, follow=args.follow, fromdate=args.fromdate,
-                               todate=args.todate, plot_path=args.plot)
+            f = open(args.logfile, 'r') if follow else open_log_file(args.logfile)
+            with f:
+                process_log_file(f, follow=args.follow, from_dt=from_dt,
+                               to_dt=to_dt, plot_path=args.plot)
         except FileNotFoundError:
             print(f"Error: Log file not found: {args.logfile}", file=sys.stderr)
             sys.exit(1)
         except PermissionError:
             print(f"Error: Permission denied: {args.logfile}", file=sys.stderr)
             sys.exit(1)
+        except CompressedLogError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except decompression_errors() as e:
+            print(f"Error: Could not decompress {args.logfile}: {e}", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == '__main__':